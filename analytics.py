@@ -0,0 +1,213 @@
+# ============================================================================
+# FILE: analytics.py (NO PANDAS VERSION)
+# ============================================================================
+from datetime import date
+from calendar import monthrange
+from typing import Dict, List, Tuple
+from utils import calculate_working_days, billed_day_shares
+
+Month = Tuple[int, int]
+
+GROUPINGS = ('tool', 'role', 'project', 'month')
+HEATMAP_GROUPINGS = ('employee', 'tool', 'role')
+
+
+def parse_month(value: str) -> Month:
+    """Parse a 'YYYY-MM' string into a (year, month) tuple"""
+    try:
+        year, month = (int(part) for part in value.split('-'))
+        date(year, month, 1)
+    except (ValueError, AttributeError):
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM")
+    return year, month
+
+
+def format_month(month: Month) -> str:
+    return f"{month[0]:04d}-{month[1]:02d}"
+
+
+def month_span(start: Month, end: Month) -> List[Month]:
+    """All months from start to end, inclusive"""
+    months = []
+    year, month = start
+    while (year, month) <= end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class MonthCube:
+    """Billed days pre-aggregated per employee and per project per month.
+
+    Built in one pass over Daily_Billing when the data is loaded, so every
+    rollup afterwards only touches month cells, never billing rows.
+    """
+
+    def __init__(self, employees: List[Dict], projects: List[Dict],
+                 assignments: List[Dict], billing_records: List[Dict]):
+        self.employees = {e.get('Employee_ID'): e for e in employees}
+        self.projects = {p.get('Project_ID'): p for p in projects}
+
+        # Distinct billed days per employee; repeated rows count once
+        billed = {}
+        for record in billing_records:
+            if record.get('Is_Billed') == 'Yes' and record.get('Date'):
+                billed.setdefault(record.get('Employee_ID'), set()).add(record.get('Date'))
+
+        # employee_id -> {month: billed days}
+        self.employee_days = {}
+        for employee_id, days in billed.items():
+            cells = self.employee_days.setdefault(employee_id, {})
+            for day in days:
+                cells[(day.year, day.month)] = cells.get((day.year, day.month), 0) + 1
+
+        # project_id -> {month: billed days}, from the de-duplicated shares
+        self.project_days = {}
+        for _, project_id, day, share in billed_day_shares(billing_records, assignments):
+            cells = self.project_days.setdefault(project_id, {})
+            cells[(day.year, day.month)] = cells.get((day.year, day.month), 0) + share
+
+        months = [m for cells in self.employee_days.values() for m in cells]
+        self.first_month = min(months) if months else None
+        self.last_month = max(months) if months else None
+        self._working_days = {}
+
+    def working_days(self, month: Month) -> int:
+        if month not in self._working_days:
+            self._working_days[month] = calculate_working_days(*month)
+        return self._working_days[month]
+
+    def months(self, start: Month = None, end: Month = None) -> List[Month]:
+        """Requested range, defaulting to the span of the billing data"""
+        today = date.today()
+        start = start or self.first_month or (today.year, today.month)
+        end = end or max(self.last_month or start, (today.year, today.month))
+        return month_span(start, end)
+
+    def _is_active(self, employee: Dict, month: Month) -> bool:
+        """Employee had joined by the end of the month"""
+        joining_date = employee.get('Joining_Date')
+        if not joining_date:
+            return True
+        month_end = date(month[0], month[1], monthrange(*month)[1])
+        return joining_date.date() <= month_end
+
+    def _employee_groups(self, by: str) -> Dict[str, List[int]]:
+        groups = {}
+        for emp_id, employee in self.employees.items():
+            if by == 'tool':
+                key = employee.get('Tool') or 'N/A'
+            elif by == 'role':
+                key = employee.get('Role') or 'N/A'
+            elif by == 'employee':
+                key = str(emp_id)
+            else:
+                key = 'All'
+            groups.setdefault(key, []).append(emp_id)
+        return groups
+
+    def _utilization_cell(self, emp_ids: List[int], month: Month) -> Dict:
+        billed = 0
+        headcount = 0
+        for emp_id in emp_ids:
+            if not self._is_active(self.employees[emp_id], month):
+                continue
+            headcount += 1
+            billed += self.employee_days.get(emp_id, {}).get(month, 0)
+
+        capacity = headcount * self.working_days(month)
+        return {
+            'month': format_month(month),
+            'billed_days': billed,
+            'capacity_days': capacity,
+            'utilization': round(billed / capacity * 100, 1) if capacity else 0.0
+        }
+
+    def _project_cell(self, project_id: int, month: Month) -> Dict:
+        billed = self.project_days.get(project_id, {}).get(month, 0)
+        return {
+            'month': format_month(month),
+            'billed_days': round(billed, 1),
+            'fte': round(billed / self.working_days(month), 2)
+        }
+
+    def rollup(self, by: str, start: Month = None, end: Month = None) -> Dict[str, List[Dict]]:
+        """Monthly series per tool, role or project ('month' for overall)"""
+        months = self.months(start, end)
+
+        if by == 'project':
+            return {
+                str(project_id): [self._project_cell(project_id, m) for m in months]
+                for project_id in self.projects
+            }
+
+        return {
+            key: [self._utilization_cell(emp_ids, m) for m in months]
+            for key, emp_ids in self._employee_groups(by).items()
+        }
+
+    def rolling(self, by: str, window: int = 3,
+                start: Month = None, end: Month = None) -> Dict[str, List[Dict]]:
+        """Trailing average of each rollup series over ``window`` months"""
+        metric = 'fte' if by == 'project' else 'utilization'
+        result = {}
+
+        for key, series in self.rollup(by, start, end).items():
+            rolled = []
+            for i, cell in enumerate(series):
+                values = [c[metric] for c in series[max(0, i - window + 1):i + 1]]
+                rolled.append(dict(cell, **{
+                    'rolling_' + metric: round(sum(values) / len(values), 2)
+                }))
+            result[key] = rolled
+
+        return result
+
+    def heatmap(self, by: str, start: Month = None, end: Month = None) -> Dict:
+        """Utilization matrix of rows (employees, tools or roles) x months"""
+        months = self.months(start, end)
+        rows = []
+
+        for key, emp_ids in sorted(self._employee_groups(by).items()):
+            label = key
+            if by == 'employee':
+                label = self.employees[emp_ids[0]].get('Employee_Name', 'Unknown')
+            rows.append({
+                'key': key,
+                'label': label,
+                'values': [self._utilization_cell(emp_ids, m)['utilization'] for m in months]
+            })
+
+        return {'months': [format_month(m) for m in months], 'rows': rows}
+
+    def bench(self, threshold: float = 20.0, min_months: int = 1,
+              start: Month = None, end: Month = None) -> List[Dict]:
+        """Runs of consecutive months an employee billed below threshold %"""
+        months = self.months(start, end)
+        periods = []
+
+        for emp_id, employee in self.employees.items():
+            run = []
+            for month in months + [None]:
+                cell = None
+                if month and self._is_active(employee, month):
+                    cell = self._utilization_cell([emp_id], month)
+
+                if cell and cell['utilization'] < threshold:
+                    run.append(cell)
+                    continue
+
+                if run and len(run) >= min_months:
+                    periods.append({
+                        'Employee_ID': emp_id,
+                        'Employee_Name': employee.get('Employee_Name', 'Unknown'),
+                        'Tool': employee.get('Tool', 'N/A'),
+                        'start_month': run[0]['month'],
+                        'end_month': run[-1]['month'],
+                        'months': len(run),
+                        'bench_days': sum(c['capacity_days'] - c['billed_days'] for c in run)
+                    })
+                run = []
+
+        periods.sort(key=lambda p: p['bench_days'], reverse=True)
+        return periods
@@ -1,20 +1,80 @@
 # ============================================================================
 # FILE: app.py (NO PANDAS VERSION - FIXED)
 # ============================================================================
-from flask import Flask, render_template, jsonify, request
+from flask import Blueprint, Flask, Response, current_app, render_template, jsonify, request
+from werkzeug.local import LocalProxy
 from data_manager import DataManager
-from utils import *
+from live_updates import LiveUpdates, average_billability
+from analytics import GROUPINGS, HEATMAP_GROUPINGS, parse_month
+from utils import (calculate_monthly_billability, calculate_yearly_billability,
+                   get_monthly_trend, generate_yearly_grid,
+                   get_current_projects_count, get_yearly_projects_count)
 from config import Config
 from datetime import datetime
 import traceback
 
-app = Flask(__name__)
-app.config.from_object(Config)
+bp = Blueprint('main', __name__)
 
-# Initialize data manager
-data_manager = DataManager(app.config['EXCEL_FILE_PATH'])
+# Per-app services, created by create_app()
+data_manager = LocalProxy(lambda: current_app.extensions['data_manager'])
 
-@app.route('/')
+# Pushes dashboard deltas to open /tool pages after a reload
+live_updates = LocalProxy(lambda: current_app.extensions['live_updates'])
+
+def build_members_data(tool_name):
+    """Compute dashboard metrics for every employee of a tool"""
+    data = data_manager.load_data()
+    employees = data_manager.get_employees(tool=tool_name)
+    
+    current_year = datetime.now().year
+    current_month = datetime.now().month
+    
+    # Calculate metrics for each employee
+    members_data = []
+    for emp in employees:
+        emp_id = emp.get('Employee_ID')
+        
+        # Current month billability
+        current_billability = calculate_monthly_billability(
+            data['daily_billing'], emp_id, current_year, current_month
+        )
+        
+        # Yearly billability
+        yearly_billability = calculate_yearly_billability(
+            data['daily_billing'], emp_id, current_year
+        )
+        
+        # Monthly trend
+        trend = get_monthly_trend(
+            data['daily_billing'], emp_id, current_year
+        )
+        
+        # Project counts
+        current_projects = get_current_projects_count(
+            data['assignments'], data['projects'], emp_id
+        )
+        
+        yearly_projects = get_yearly_projects_count(
+            data['assignments'], data['projects'], emp_id, current_year
+        )
+        
+        members_data.append({
+            'Employee_ID': int(emp_id),
+            'Employee_Name': emp.get('Employee_Name', 'Unknown'),
+            'Role': emp.get('Role', 'N/A'),
+            'current_billability': current_billability,
+            'yearly_billability': yearly_billability,
+            'trend': trend,
+            'current_projects': current_projects,
+            'yearly_projects': yearly_projects
+        })
+    
+    # Sort by yearly billability
+    members_data.sort(key=lambda x: x['yearly_billability'], reverse=True)
+    
+    return members_data
+
+@bp.route('/')
 def index():
     """Homepage with three project sections"""
     try:
@@ -32,28 +92,16 @@ def index():
     except Exception as e:
         return f"Error: {str(e)}<br>{traceback.format_exc()}", 500
 
-@app.route('/api/project/<int:project_id>')
+@bp.route('/api/project/<int:project_id>')
 def project_details(project_id):
     """Get project details with team members grouped by tool"""
     try:
-        data = data_manager.load_data()
-        
         # Get project info
-        project = None
-        for p in data['projects']:
-            if p.get('Project_ID') == project_id:
-                project = p.copy()
-                break
+        project = data_manager.get_project(project_id)
         
         if not project:
             return jsonify({'success': False, 'error': 'Project not found'}), 404
         
-        # Format dates
-        if project.get('Start_Date'):
-            project['Start_Date'] = project['Start_Date'].strftime('%Y-%m-%d')
-        if project.get('End_Date'):
-            project['End_Date'] = project['End_Date'].strftime('%Y-%m-%d')
-        
         # Get project members
         members_list = data_manager.get_project_members(project_id)
         
@@ -64,19 +112,16 @@ def project_details(project_id):
             
             members_formatted = []
             for member in tool_members:
-                billed_days = count_billed_days(
-                    data['daily_billing'],
-                    member.get('Employee_ID'),
-                    project_id,
-                    data['assignments']
+                billed_days = data_manager.get_billed_days(
+                    member.get('Employee_ID'), project_id
                 )
                 
                 members_formatted.append({
                     'Employee_ID': int(member.get('Employee_ID', 0)),
                     'Employee_Name': member.get('Employee_Name', 'Unknown'),
                     'Role': member.get('Role', 'N/A'),
-                    'Billing_Start_Date': member.get('Billing_Start_Date').strftime('%Y-%m-%d') if member.get('Billing_Start_Date') else 'N/A',
-                    'Billing_End_Date': member.get('Billing_End_Date').strftime('%Y-%m-%d') if member.get('Billing_End_Date') else 'N/A',
+                    'Billing_Start_Date': member.Billing_Start_Date_Str or 'N/A',
+                    'Billing_End_Date': member.Billing_End_Date_Str or 'N/A',
                     'billed_days': billed_days
                 })
             
@@ -85,7 +130,7 @@ def project_details(project_id):
         
         return jsonify({
             'success': True,
-            'project': project,
+            'project': project.to_dict(),
             'members': grouped_members
         })
     
@@ -95,90 +140,39 @@ def project_details(project_id):
             'error': str(e)
         }), 500
 
-@app.route('/tool/<tool_name>')
+@bp.route('/tool/<tool_name>')
 def tool_dashboard(tool_name):
     """Tool-specific dashboard"""
     try:
         if tool_name not in Config.TOOLS:
             return "Invalid tool", 404
         
-        data = data_manager.load_data()
-        employees = data_manager.get_employees(tool=tool_name)
-        
-        current_year = datetime.now().year
-        current_month = datetime.now().month
-        
-        # Calculate metrics for each employee
-        members_data = []
-        for emp in employees:
-            emp_id = emp.get('Employee_ID')
-            
-            # Current month billability
-            current_billability = calculate_monthly_billability(
-                data['daily_billing'], emp_id, current_year, current_month
-            )
-            
-            # Yearly billability
-            yearly_billability = calculate_yearly_billability(
-                data['daily_billing'], emp_id, current_year
-            )
-            
-            # Monthly trend
-            trend = get_monthly_trend(
-                data['daily_billing'], emp_id, current_year
-            )
-            
-            # Project counts
-            current_projects = get_current_projects_count(
-                data['assignments'], data['projects'], emp_id
-            )
-            
-            yearly_projects = get_yearly_projects_count(
-                data['assignments'], data['projects'], emp_id, current_year
-            )
-            
-            members_data.append({
-                'Employee_ID': int(emp_id),
-                'Employee_Name': emp.get('Employee_Name', 'Unknown'),
-                'Role': emp.get('Role', 'N/A'),
-                'current_billability': current_billability,
-                'yearly_billability': yearly_billability,
-                'trend': trend,
-                'current_projects': current_projects,
-                'yearly_projects': yearly_projects
-            })
-        
-        # Sort by yearly billability
-        members_data.sort(key=lambda x: x['yearly_billability'], reverse=True)
+        members_data = build_members_data(tool_name)
+        live_updates.prime(tool_name, members_data)
         
         # Calculate average billability for the tool
-        avg_billability = round(
-            sum(m['current_billability'] for m in members_data) / len(members_data), 1
-        ) if members_data else 0
+        avg_billability = average_billability(members_data)
         
         return render_template('tool_dashboard.html',
                              tool_name=tool_name,
                              members=members_data,
                              total_members=len(members_data),
                              avg_billability=avg_billability,
+                             live_version=live_updates.version,
                              tools=Config.TOOLS,
                              active_page=tool_name)
     
     except Exception as e:
         return f"Error: {str(e)}<br>{traceback.format_exc()}", 500
 
-@app.route('/member/<int:employee_id>')
+@bp.route('/member/<int:employee_id>')
 def member_profile(employee_id):
     """Individual member profile page"""
     try:
         data = data_manager.load_data()
         
         # Get employee details
-        employee = None
-        for emp in data['employees']:
-            if emp.get('Employee_ID') == employee_id:
-                employee = emp
-                break
+        employee = data_manager.get_employee(employee_id)
         
         if not employee:
             return "Employee not found", 404
@@ -190,19 +184,16 @@ def member_profile(employee_id):
         
         projects_formatted = []
         for proj in projects_list:
-            billed_days = count_billed_days(
-                data['daily_billing'],
-                employee_id,
-                proj.get('Project_ID'),
-                data['assignments']
+            billed_days = data_manager.get_billed_days(
+                employee_id, proj.get('Project_ID')
             )
             
             projects_formatted.append({
                 'Project_ID': int(proj.get('Project_ID', 0)),
                 'Project_Name': proj.get('Project_Name', 'Unknown'),
                 'Project_Status': proj.get('Project_Status', 'N/A'),
-                'Start_Date': proj.get('Billing_Start_Date').strftime('%Y-%m-%d') if proj.get('Billing_Start_Date') else 'N/A',
-                'End_Date': proj.get('Billing_End_Date').strftime('%Y-%m-%d') if proj.get('Billing_End_Date') else 'N/A',
+                'Start_Date': proj.Billing_Start_Date_Str or 'N/A',
+                'End_Date': proj.Billing_End_Date_Str or 'N/A',
                 'billed_days': billed_days
             })
         
@@ -227,7 +218,7 @@ def member_profile(employee_id):
                                  'Employee_Name': employee.get('Employee_Name', 'Unknown'),
                                  'Tool': employee.get('Tool', 'N/A'),
                                  'Role': employee.get('Role', 'N/A'),
-                                 'Joining_Date': employee.get('Joining_Date').strftime('%Y-%m-%d') if employee.get('Joining_Date') else 'N/A'
+                                 'Joining_Date': employee.Joining_Date_Str or 'N/A'
                              },
                              projects=projects_formatted,
                              monthly_trend=monthly_trend,
@@ -239,14 +230,178 @@ def member_profile(employee_id):
     except Exception as e:
         return f"Error: {str(e)}<br>{traceback.format_exc()}", 500
 
-@app.route('/api/reload')
+@bp.route('/api/reload')
 def reload_data():
     """Force reload Excel data"""
     try:
+        # Open dashboards get their deltas from the reload listener
         data_manager.load_data(force_reload=True)
+        
+        # Best effort: the reload already succeeded without it
+        try:
+            data_manager.save_snapshot()
+        except OSError as e:
+            current_app.logger.warning("Could not write snapshot: %s", e)
+        
         return jsonify({'success': True, 'message': 'Data reloaded successfully'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _month_range_args():
+    """Optional ?start=YYYY-MM&end=YYYY-MM range for analytics queries"""
+    start = request.args.get('start')
+    end = request.args.get('end')
+    return (parse_month(start) if start else None,
+            parse_month(end) if end else None)
+
+def _grouping_arg(allowed, default):
+    by = request.args.get('by', default)
+    if by not in allowed:
+        raise ValueError(f"Invalid grouping '{by}', expected one of: {', '.join(allowed)}")
+    return by
+
+@bp.route('/api/analytics/rollup')
+def analytics_rollup():
+    """Monthly billed days and utilization grouped by tool, role, project or month"""
+    try:
+        by = _grouping_arg(GROUPINGS, 'tool')
+        start, end = _month_range_args()
+        cube = data_manager.get_month_cube()
+        return jsonify({'success': True, 'by': by, 'series': cube.rollup(by, start, end)})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/analytics/rolling')
+def analytics_rolling():
+    """Rolling average of a rollup over ?window= months"""
+    try:
+        by = _grouping_arg(GROUPINGS, 'tool')
+        window = request.args.get('window', 3, type=int)
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        start, end = _month_range_args()
+        cube = data_manager.get_month_cube()
+        return jsonify({'success': True, 'by': by, 'window': window,
+                        'series': cube.rolling(by, window, start, end)})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/analytics/heatmap')
+def analytics_heatmap():
+    """Utilization heatmap of employees, tools or roles by month"""
+    try:
+        by = _grouping_arg(HEATMAP_GROUPINGS, 'employee')
+        start, end = _month_range_args()
+        cube = data_manager.get_month_cube()
+        return jsonify({'success': True, 'by': by, **cube.heatmap(by, start, end)})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/analytics/bench')
+def analytics_bench():
+    """Periods where employees billed below ?threshold= percent"""
+    try:
+        threshold = request.args.get('threshold', 20.0, type=float)
+        min_months = request.args.get('min_months', 1, type=int)
+        start, end = _month_range_args()
+        cube = data_manager.get_month_cube()
+        return jsonify({'success': True, 'threshold': threshold,
+                        'periods': cube.bench(threshold, min_months, start, end)})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/stream/<tool_name>')
+def stream_updates(tool_name):
+    """Server-Sent Events stream of dashboard deltas for a tool"""
+    if tool_name not in Config.TOOLS:
+        return jsonify({'success': False, 'error': 'Invalid tool'}), 404
+    
+    # Resume from the browser's Last-Event-ID, else the rendered version
+    after = request.headers.get('Last-Event-ID', type=int)
+    if after is None:
+        after = request.args.get('since', type=int)
+    
+    if tool_name not in live_updates.tools():
+        live_updates.prime(tool_name, build_members_data(tool_name))
+    
+    return Response(live_updates.stream(tool_name, after),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache',
+                             'X-Accel-Buffering': 'no'})
+
+@bp.route('/api/validation')
+def validation_report():
+    """Data validation report, optionally filtered by ?sheet= and ?severity="""
+    try:
+        report = data_manager.get_validation_report()
+        
+        sheet = request.args.get('sheet')
+        severity = request.args.get('severity')
+        issues = [i for i in report['issues']
+                  if (not sheet or i['sheet'] == sheet) and
+                     (not severity or i['severity'] == severity)]
+        
+        return jsonify({'success': True, **report, 'issues': issues})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/ready')
+def readiness():
+    """Readiness probe: 200 once preload finished, 503 while warming"""
+    state = data_manager.preload_state
+    if state == 'failed' or (state == 'idle' and not data_manager.is_warm()):
+        # Retry a failed preload, or warm up now when it was never started
+        data_manager.preload_async()
+    
+    # Lazily loaded data counts when preloading is off
+    ready = data_manager.preload_state == 'ready' or (
+        data_manager.preload_state == 'idle' and data_manager.is_warm())
+    status = {
+        'ready': ready,
+        'preload': data_manager.preload_state,
+        'source': data_manager.preload_source
+    }
+    if data_manager.preload_error:
+        status['error'] = data_manager.preload_error
+    
+    return jsonify(status), 200 if ready else 503
+
+def _publish_deltas(app, keys):
+    """Push what changed to open dashboards after any sheet reload"""
+    # Every sheet feeds the dashboards, so the reloaded keys don't matter
+    with app.app_context():
+        for tool_name in live_updates.tools():
+            live_updates.publish(tool_name, build_members_data(tool_name))
+
+def create_app(config_object=Config):
+    """Build the Flask app; data loading happens after startup, not at import"""
+    app = Flask(__name__)
+    app.config.from_object(config_object)
+    
+    # Initialize data manager
+    manager = DataManager(app.config['EXCEL_FILE_PATH'],
+                          snapshot_path=app.config.get('SNAPSHOT_PATH'),
+                          strict=app.config.get('STRICT_VALIDATION', False))
+    app.extensions['data_manager'] = manager
+    app.extensions['live_updates'] = LiveUpdates()
+    
+    # Covers /api/reload and the periodic per-sheet refresh alike
+    manager.add_reload_listener(lambda keys: _publish_deltas(app, keys))
+    
+    app.register_blueprint(bp)
+    
+    if app.config.get('PRELOAD_ON_START'):
+        manager.preload_async()
+    
+    return app
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    create_app().run(debug=True, port=5000)
\ No newline at end of file
@@ -7,6 +7,15 @@ class Config:
     # Cache settings
     CACHE_TIMEOUT = 300  # 5 minutes
     
+    # Parsed data is pickled here so restarts skip the workbook parse
+    SNAPSHOT_PATH = os.path.join('data', 'billability_data.snapshot.pkl')
+    
+    # Warm the cache on a background thread right after startup
+    PRELOAD_ON_START = True
+    
+    # Fail the load on the first sheet with invalid rows instead of skipping them
+    STRICT_VALIDATION = False
+    
     # Capgemini colors
     COLORS = {
         'primary': '#0070AD',
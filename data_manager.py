@@ -1,22 +1,115 @@
-from openpyxl import load_workbook
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Callable, Dict, List, Set, Tuple
+from models import Record, Employee, Project, Assignment, BillingDay, JoinedView
+from utils import attribute_billed_days
+from analytics import MonthCube
+from validation import (SheetReport, DataValidationError, normalize_sheet,
+                        build_report, issue, parse_date,
+                        SCHEMAS, CHOICES, UNIQUE, REFERENCES, DATE_RANGES)
+import hashlib
+import logging
 import os
+import pickle
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Bump when parsing or record layout changes in a way the schema tables
+# don't show, so snapshots written by older code are ignored
+SNAPSHOT_FORMAT = 1
+
+
+def _off_hub(func: Callable, *args):
+    """Call ``func(*args)``, on a native thread when gevent patched threading.
+
+    Under gevent every Thread, the preload one included, is a greenlet, so
+    CPU-bound parsing would stall all other requests in the worker. The
+    caller waits cooperatively while gevent's threadpool does the work.
+    Only lock-free work may be passed: gevent locks don't wake greenlets
+    when released from a native thread.
+    """
+    try:
+        from gevent import get_hub, monkey
+    except ImportError:
+        return func(*args)
+    if not monkey.is_module_patched('threading'):
+        return func(*args)
+    return get_hub().threadpool.apply(func, args)
+
 
 class DataManager:
     """Handles all Excel data loading using only openpyxl"""
     
-    def __init__(self, excel_path: str):
+    # Cache key -> worksheet name
+    SHEETS = {
+        'employees': 'Employees',
+        'projects': 'Projects',
+        'assignments': 'Project_Assignments',
+        'daily_billing': 'Daily_Billing'
+    }
+    
+    # Cache key -> immutable record type
+    RECORD_TYPES = {
+        'employees': Employee,
+        'projects': Project,
+        'assignments': Assignment,
+        'daily_billing': BillingDay
+    }
+    
+    # Cache key -> column the dataset is indexed by
+    INDEX_COLUMNS = {
+        'employees': 'Employee_ID',
+        'projects': 'Project_ID'
+    }
+    
+    def __init__(self, excel_path: str, snapshot_path: str = None, strict: bool = False):
         self.excel_path = excel_path
+        self.snapshot_path = snapshot_path
+        self.strict = strict
         self._cache = {}
-        self._last_load = None
+        self._index = {}
+        self._sheet_reports = {}
+        self._signatures = {}
+        self._attribution = None
+        self._cube = None
+        self._validation = None
+        self._last_load = {}
+        self._lock = threading.RLock()
         self.cache_duration = timedelta(minutes=5)
+        
+        # Background preload status, reported by the readiness endpoint
+        self.preload_state = 'idle'
+        self.preload_source = None
+        self.preload_error = None
+        self._preload_guard = threading.Lock()
+        
+        # Called with the set of re-read sheets after every workbook load
+        self._reload_listeners = []
+        self._reloaded = set()
     
-    def _should_reload(self) -> bool:
-        """Check if cache should be refreshed"""
-        if not self._last_load:
+    def add_reload_listener(self, callback: Callable[[Set[str]], None]):
+        """Register ``callback(keys)`` to run after sheets are re-read"""
+        self._reload_listeners.append(callback)
+    
+    def _notify_reloaded(self):
+        """Run reload listeners outside the lock, once per batch of sheets"""
+        with self._lock:
+            keys, self._reloaded = self._reloaded, set()
+        if not keys:
+            return
+        for callback in self._reload_listeners:
+            try:
+                callback(keys)
+            except Exception:
+                logger.exception("Reload listener failed for %s", sorted(keys))
+    
+    def _should_reload(self, key: str) -> bool:
+        """Check if the cached dataset should be refreshed"""
+        last_load = self._last_load.get(key)
+        if not last_load or key not in self._cache:
             return True
-        return datetime.now() - self._last_load > self.cache_duration
+        return datetime.now() - last_load > self.cache_duration
     
     def _sheet_to_dict_list(self, worksheet) -> List[Dict]:
         """Convert worksheet to list of dictionaries"""
@@ -35,73 +128,234 @@ class DataManager:
         
         return data
     
-    def load_data(self, force_reload: bool = False) -> Dict[str, List[Dict]]:
-        """Load all Excel sheets into dictionaries with caching"""
-        if not force_reload and not self._should_reload() and self._cache:
-            return self._cache
+    def _read_sheet(self, key: str) -> List[Dict]:
+        """Read a single sheet; other sheets are never parsed"""
+        # Imported here so startup never pays for openpyxl
+        from openpyxl import load_workbook
         
+        # read_only mode streams only the worksheet we iterate
+        workbook = load_workbook(self.excel_path, read_only=True, data_only=True)
+        try:
+            sheet_name = self.SHEETS[key]
+            if sheet_name not in workbook.sheetnames:
+                if key == 'daily_billing':
+                    return None
+                raise KeyError(f"Worksheet {sheet_name} does not exist.")
+            return self._sheet_to_dict_list(workbook[sheet_name])
+        finally:
+            workbook.close()
+    
+    def get_dataset(self, key: str, force_reload: bool = False) -> Tuple[Record, ...]:
+        """Load one dataset on first access, with its own cache freshness"""
+        records = self._fetch(key, force_reload)
+        self._notify_reloaded()
+        return records
+    
+    def _fetch(self, key: str, force_reload: bool = False) -> Tuple[Record, ...]:
+        if not force_reload and not self._should_reload(key):
+            return self._cache[key]
+        
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            if not force_reload and not self._should_reload(key):
+                return self._cache[key]
+            return self._load_dataset(key)
+    
+    def _load_dataset(self, key: str) -> Tuple[Record, ...]:
+        """Read, normalize and cache one sheet"""
         try:
-            workbook = load_workbook(self.excel_path, data_only=True)
+            sheet_name = self.SHEETS[key]
             
-            # Load all sheets
-            employees = self._sheet_to_dict_list(workbook['Employees'])
-            projects = self._sheet_to_dict_list(workbook['Projects'])
-            assignments = self._sheet_to_dict_list(workbook['Project_Assignments'])
+            # Taken before reading, so a save mid-parse can't be mislabelled
+            signature = self._source_signature()
+            rows = _off_hub(self._read_sheet, key)
             
-            # Try to load Daily_Billing, generate if missing
-            try:
-                daily_billing = self._sheet_to_dict_list(workbook['Daily_Billing'])
-            except:
-                daily_billing = self._generate_daily_billing(assignments)
-            
-            # Convert date strings to datetime objects
-            for emp in employees:
-                if emp.get('Joining_Date'):
-                    emp['Joining_Date'] = self._parse_date(emp['Joining_Date'])
-            
-            for proj in projects:
-                if proj.get('Start_Date'):
-                    proj['Start_Date'] = self._parse_date(proj['Start_Date'])
-                if proj.get('End_Date'):
-                    proj['End_Date'] = self._parse_date(proj['End_Date'])
-            
-            for assign in assignments:
-                if assign.get('Billing_Start_Date'):
-                    assign['Billing_Start_Date'] = self._parse_date(assign['Billing_Start_Date'])
-                if assign.get('Billing_End_Date'):
-                    assign['Billing_End_Date'] = self._parse_date(assign['Billing_End_Date'])
-            
-            for billing in daily_billing:
-                if billing.get('Date'):
-                    billing['Date'] = self._parse_date(billing['Date'])
-            
-            self._cache = {
-                'employees': employees,
-                'projects': projects,
-                'assignments': assignments,
-                'daily_billing': daily_billing
-            }
-            
-            self._last_load = datetime.now()
-            workbook.close()
-            return self._cache
+            if rows is None:
+                # Generate Daily_Billing if the sheet is missing
+                rows = self._generate_daily_billing(self._fetch('assignments'))
+                report = SheetReport(sheet_name)
+                report.issues.append(issue(
+                    sheet_name, None, None,
+                    'sheet missing; generated from Project_Assignments',
+                    severity='warning'
+                ))
+            else:
+                # Type-check, convert dates and drop bad rows in one pass
+                rows, report = _off_hub(normalize_sheet, key, sheet_name, rows)
+                if self.strict and report.error_count:
+                    first = next(i for i in report.issues if i['severity'] == 'error')
+                    raise DataValidationError(
+                        f"{sheet_name} has {report.error_count} error(s), first at "
+                        f"row {first['row']} ({first['column']}): {first['message']}"
+                    )
             
+            # Freeze rows so every caller can share the cached records
+            record_type = self.RECORD_TYPES[key]
+            records = tuple(record_type(row) for row in rows)
+            
+            self._store(key, records, report, signature)
+            self._reloaded.add(key)
+            return records
+            
+        except DataValidationError:
+            raise
         except Exception as e:
             raise Exception(f"Error loading Excel file: {str(e)}")
     
-    def _parse_date(self, date_value):
-        """Parse date from various formats"""
-        if isinstance(date_value, datetime):
-            return date_value
-        if isinstance(date_value, str):
-            try:
-                return datetime.strptime(date_value, '%Y-%m-%d')
-            except:
+    def _store(self, key: str, records: Tuple[Record, ...], report: SheetReport,
+               signature: Tuple[float, int]):
+        """Cache a dataset with its ID index, validation report and source version"""
+        if key in self.INDEX_COLUMNS:
+            column = self.INDEX_COLUMNS[key]
+            self._index[key] = {r.get(column): r for r in records}
+        
+        self._sheet_reports[key] = report
+        self._signatures[key] = signature
+        self._cache[key] = records
+        self._last_load[key] = datetime.now()
+    
+    def load_data(self, force_reload: bool = False) -> Dict[str, Tuple[Record, ...]]:
+        """Load all Excel sheets into dictionaries with caching"""
+        # Datasets are swapped one by one, so readers never see an empty cache
+        data = {key: self._fetch(key, force_reload) for key in self.SHEETS}
+        self._notify_reloaded()
+        return data
+    
+    def is_warm(self) -> bool:
+        """True once every dataset is cached"""
+        return all(key in self._cache for key in self.SHEETS)
+    
+    def _source_signature(self) -> Tuple[float, int]:
+        """Identifies the workbook version a snapshot was taken from"""
+        stat = os.stat(self.excel_path)
+        return stat.st_mtime, stat.st_size
+    
+    def _snapshot_version(self) -> str:
+        """Fingerprint of everything that shapes the cached records"""
+        layout = (SNAPSHOT_FORMAT, SCHEMAS, CHOICES, UNIQUE, REFERENCES, DATE_RANGES,
+                  [(key, t.__name__, t.FIELDS, t.__slots__)
+                   for key, t in self.RECORD_TYPES.items()])
+        return hashlib.sha1(repr(layout).encode()).hexdigest()
+    
+    def load_snapshot(self) -> bool:
+        """Fill the cache from the snapshot if it matches the workbook"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        
+        # Any unreadable, stale or incompatible snapshot is just a cache miss
+        try:
+            snapshot = _off_hub(self._read_snapshot)
+            
+            # Written by code with different schemas or record types
+            if snapshot.get('version') != self._snapshot_version():
+                return False
+            
+            signature = snapshot['signature']
+            if signature != self._source_signature():
+                return False
+            
+            entries = [(key, snapshot['datasets'][key], snapshot['validation'][key])
+                       for key in self.SHEETS]
+            
+            # Written by a lenient run: reload so strict mode can reject it
+            if self.strict and any(report.error_count for _, _, report in entries):
+                return False
+        except Exception as e:
+            logger.warning("Ignoring snapshot %s: %s", self.snapshot_path, e)
+            return False
+        
+        with self._lock:
+            for key, records, report in entries:
+                self._store(key, records, report, signature)
+        return True
+    
+    def _read_snapshot(self) -> Dict:
+        with open(self.snapshot_path, 'rb') as f:
+            return pickle.load(f)
+    
+    def save_snapshot(self) -> bool:
+        """Write the cached datasets next to the workbook for fast restarts"""
+        if not self.snapshot_path:
+            return False
+        
+        with self._lock:
+            datasets = {key: self._fetch(key) for key in self.SHEETS}
+            signatures = {self._signatures[key] for key in datasets}
+            reports = {key: self._sheet_reports[key] for key in datasets}
+        self._notify_reloaded()
+        
+        # Sheets read from different workbook versions must not be stored
+        if len(signatures) != 1:
+            return False
+        
+        snapshot = {
+            'version': self._snapshot_version(),
+            'signature': signatures.pop(),
+            'datasets': datasets,
+            'validation': reports
+        }
+        
+        # Unique temp file, then rename: concurrent workers never collide
+        # and a crash never leaves a truncated snapshot
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.snapshot_path) or '.',
+                                        suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+    
+    def preload(self):
+        """Warm the cache from the snapshot, or the workbook as a fallback"""
+        self.preload_state = 'loading'
+        try:
+            if self.load_snapshot():
+                self.preload_source = 'snapshot'
+            else:
+                self.load_data()
+                self.preload_source = 'excel'
+                
+                # Data is warm either way; a failed write only slows the next boot
                 try:
-                    return datetime.strptime(date_value, '%Y-%m-%d %H:%M:%S')
-                except:
-                    return datetime.now()
-        return date_value
+                    self.save_snapshot()
+                except OSError as e:
+                    logger.warning("Could not write snapshot %s: %s", self.snapshot_path, e)
+            
+            # Build derived tables too, so the first request is fully warm
+            self._billed_days_table()
+            self.get_month_cube()
+            self.get_validation_report()
+            self.preload_error = None
+            self.preload_state = 'ready'
+        except Exception as e:
+            self.preload_error = str(e)
+            self.preload_state = 'failed'
+    
+    def preload_async(self) -> bool:
+        """Run preload on a daemon thread so startup does not block.
+
+        Returns False, starting nothing, while a preload is already running;
+        a failed or finished one is started again.
+        """
+        with self._preload_guard:
+            if self.preload_state == 'loading':
+                return False
+            self.preload_state = 'loading'
+        
+        threading.Thread(target=self.preload, name='data-preload', daemon=True).start()
+        return True
+    
+    def _parse_date(self, date_value):
+        """Parse date from various formats, or None if unparseable"""
+        if not date_value:
+            return None
+        try:
+            return parse_date(date_value)
+        except ValueError:
+            return None
     
     def _generate_daily_billing(self, assignments: List[Dict]) -> List[Dict]:
         """Generate daily billing records from assignments"""
@@ -128,92 +382,136 @@ class DataManager:
         
         return records
     
-    def get_employees(self, tool: str = None) -> List[Dict]:
+    def get_employees(self, tool: str = None) -> Tuple[Employee, ...]:
         """Get employees, optionally filtered by tool"""
-        data = self.load_data()
-        employees = data['employees'].copy()
+        employees = self.get_dataset('employees')
         
         if tool:
-            employees = [e for e in employees if e.get('Tool') == tool]
+            employees = tuple(e for e in employees if e.Tool == tool)
         
         return employees
     
-    def get_projects(self, status: str = None, tool: str = None) -> List[Dict]:
+    def get_employee(self, employee_id: int) -> Employee:
+        """Get a single employee by ID, or None"""
+        self.get_dataset('employees')
+        return self._index['employees'].get(employee_id)
+    
+    def get_projects(self, status: str = None, tool: str = None) -> Tuple[Project, ...]:
         """Get projects filtered by status and/or tool"""
-        data = self.load_data()
-        projects = data['projects'].copy()
+        projects = self.get_dataset('projects')
         
         if status:
-            projects = [p for p in projects if p.get('Project_Status') == status]
+            projects = tuple(p for p in projects if p.Project_Status == status)
         if tool:
-            projects = [p for p in projects if p.get('Tool') == tool]
+            projects = tuple(p for p in projects if p.Tool == tool)
         
         return projects
     
-    def get_project_members(self, project_id: int) -> List[Dict]:
+    def get_project(self, project_id: int) -> Project:
+        """Get a single project by ID, or None"""
+        self.get_dataset('projects')
+        return self._index['projects'].get(project_id)
+    
+    def get_project_members(self, project_id: int) -> List[JoinedView]:
         """Get all members assigned to a project with their details"""
-        data = self.load_data()
-        
-        # Get assignments for this project
-        project_assignments = [a for a in data['assignments'] 
-                              if a.get('Project_ID') == project_id]
+        assignments = self.get_dataset('assignments')
+        self.get_dataset('employees')
+        employees = self._index['employees']
         
-        # Merge with employee data
+        # Join each assignment with its employee
         members = []
-        for assignment in project_assignments:
-            emp_id = assignment.get('Employee_ID')
-            employee = next((e for e in data['employees'] 
-                           if e.get('Employee_ID') == emp_id), None)
+        for assignment in assignments:
+            if assignment.Project_ID != project_id:
+                continue
             
+            employee = employees.get(assignment.Employee_ID)
             if employee:
-                member = {**assignment, **employee}
-                members.append(member)
+                members.append(JoinedView(employee, assignment))
         
         return members
     
-    def get_employee_projects(self, employee_id: int, year: int = None) -> List[Dict]:
+    def get_employee_projects(self, employee_id: int, year: int = None) -> List[JoinedView]:
         """Get all projects for an employee"""
-        data = self.load_data()
-        
-        # Get employee assignments
-        employee_assignments = [a for a in data['assignments'] 
-                               if a.get('Employee_ID') == employee_id]
+        assignments = self.get_dataset('assignments')
+        self.get_dataset('projects')
+        projects_by_id = self._index['projects']
         
-        # Merge with project data
+        # Join each assignment with its project
         projects = []
-        for assignment in employee_assignments:
-            proj_id = assignment.get('Project_ID')
-            project = next((p for p in data['projects'] 
-                          if p.get('Project_ID') == proj_id), None)
+        for assignment in assignments:
+            if assignment.Employee_ID != employee_id:
+                continue
             
-            if project:
-                merged = {**assignment, **project}
+            project = projects_by_id.get(assignment.Project_ID)
+            if not project:
+                continue
+            
+            if year:
+                start_year = project.Start_Date.year if project.Start_Date else None
+                end_year = project.End_Date.year if project.End_Date else None
                 
-                if year:
-                    start_year = merged.get('Start_Date').year if merged.get('Start_Date') else None
-                    end_year = merged.get('End_Date').year if merged.get('End_Date') else None
-                    
-                    if start_year == year or end_year == year:
-                        projects.append(merged)
-                else:
-                    projects.append(merged)
+                if start_year != year and end_year != year:
+                    continue
+            
+            projects.append(JoinedView(project, assignment))
         
         return projects
     
+    def _billed_days_table(self) -> Dict[Tuple[int, int], float]:
+        """Per-(employee, project) billed days, rebuilt once per load"""
+        billing = self.get_dataset('daily_billing')
+        assignments = self.get_dataset('assignments')
+        
+        # Recompute only when either source sheet has been re-read
+        cached = self._attribution
+        if cached is None or cached[0] is not billing or cached[1] is not assignments:
+            table = attribute_billed_days(billing, assignments)
+            self._attribution = (billing, assignments, table)
+        
+        return self._attribution[2]
+    
+    def get_billed_days(self, employee_id: int, project_id: int) -> float:
+        """Billed days attributed to an employee on a specific project"""
+        billed_days = round(self._billed_days_table().get((employee_id, project_id), 0), 1)
+        return int(billed_days) if billed_days.is_integer() else billed_days
+    
+    def get_month_cube(self) -> MonthCube:
+        """Month-level aggregates for analytics, rebuilt once per load"""
+        sources = tuple(self.get_dataset(key) for key in self.SHEETS)
+        
+        # Recompute only when any source sheet has been re-read
+        cached = self._cube
+        if cached is None or any(a is not b for a, b in zip(cached[0], sources)):
+            self._cube = (sources, MonthCube(*sources))
+        
+        return self._cube[1]
+    
+    def get_validation_report(self) -> Dict:
+        """Row-level issues collected while loading, plus cross-sheet checks"""
+        self.load_data()
+        reports = {key: self._sheet_reports[key] for key in self.SHEETS}
+        sources = tuple(reports.values())
+        
+        # Cross-sheet checks only rerun when a sheet has been re-read
+        cached = self._validation
+        if cached is None or any(a is not b for a, b in zip(cached[0], sources)):
+            self._validation = (sources, build_report(reports, self._index))
+        
+        return self._validation[1]
+    
     def get_billing_records(self, employee_id: int = None, 
                            start_date: datetime = None, 
-                           end_date: datetime = None) -> List[Dict]:
+                           end_date: datetime = None) -> Tuple[BillingDay, ...]:
         """Get billing records with optional filters"""
-        data = self.load_data()
-        billing = data['daily_billing'].copy()
+        billing = self.get_dataset('daily_billing')
         
         if employee_id:
-            billing = [b for b in billing if b.get('Employee_ID') == employee_id]
+            billing = tuple(b for b in billing if b.Employee_ID == employee_id)
         
         if start_date:
-            billing = [b for b in billing if b.get('Date') and b['Date'] >= start_date]
+            billing = tuple(b for b in billing if b.Date and b.Date >= start_date)
         
         if end_date:
-            billing = [b for b in billing if b.get('Date') and b['Date'] <= end_date]
+            billing = tuple(b for b in billing if b.Date and b.Date <= end_date)
         
         return billing
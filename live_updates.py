@@ -0,0 +1,120 @@
+# ============================================================================
+# FILE: live_updates.py (NO PANDAS VERSION)
+# ============================================================================
+from collections import deque
+from typing import Dict, List
+import json
+import threading
+
+
+class LiveUpdates:
+    """Broadcasts dashboard deltas to Server-Sent Events subscribers.
+
+    The last published members list of every tool is kept as a snapshot.
+    ``publish`` diffs a freshly computed list against it and records one
+    event with only the changed employees. Subscribers all block on a
+    single shared condition, so no thread or poller exists per client;
+    under a cooperative server (e.g. gunicorn with gevent workers) an idle
+    connection costs one greenlet.
+    """
+
+    def __init__(self, history: int = 100):
+        self._condition = threading.Condition()
+        self._version = 0
+        self._events = deque(maxlen=history)
+        self._snapshots = {}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def tools(self) -> List[str]:
+        """Tools that have a snapshot and so need diffing on reload"""
+        with self._condition:
+            return list(self._snapshots)
+
+    def prime(self, tool: str, members: List[Dict]):
+        """Record the baseline a dashboard was rendered from"""
+        with self._condition:
+            if tool not in self._snapshots:
+                self._snapshots[tool] = self._by_id(members)
+
+    def publish(self, tool: str, members: List[Dict]) -> bool:
+        """Diff members against the snapshot and notify subscribers"""
+        current = self._by_id(members)
+
+        with self._condition:
+            previous = self._snapshots.get(tool, {})
+            self._snapshots[tool] = current
+
+            changed = [m for emp_id, m in current.items()
+                       if previous.get(emp_id) != m]
+            removed = [emp_id for emp_id in previous if emp_id not in current]
+
+            if not changed and not removed:
+                return False
+
+            self._version += 1
+            self._events.append((self._version, tool, {
+                'tool': tool,
+                'changed': changed,
+                'removed': removed,
+                'total_members': len(members),
+                'avg_billability': average_billability(members)
+            }))
+            self._condition.notify_all()
+            return True
+
+    def wait(self, tool: str, after: int, timeout: float):
+        """Block until events newer than ``after`` exist, or timeout.
+
+        Returns ``(latest_version, events)``; ``events`` is None when the
+        subscriber fell further behind than the retained history.
+        """
+        with self._condition:
+            if self._version <= after:
+                self._condition.wait(timeout)
+
+            # Resuming across a restart, or older than the kept history
+            if after > self._version or (self._events and self._events[0][0] > after + 1):
+                return self._version, None
+
+            events = [(version, payload) for version, event_tool, payload in self._events
+                      if version > after and event_tool == tool]
+            return self._version, events
+
+    def stream(self, tool: str, after: int = None, keepalive: float = 15.0):
+        """Generator of SSE frames for one subscriber"""
+        if after is None:
+            after = self._version
+
+        # Tell the browser how long to wait before reconnecting
+        yield 'retry: 5000\n\n'
+
+        while True:
+            latest, events = self.wait(tool, after, keepalive)
+
+            if events is None:
+                # Deltas were dropped from history; the page must re-render
+                yield f"id: {latest}\nevent: reset\ndata: {{}}\n\n"
+                after = latest
+                continue
+
+            for version, payload in events:
+                yield f"id: {version}\nevent: delta\ndata: {json.dumps(payload)}\n\n"
+
+            if not events:
+                # Comment line keeps proxies from closing idle connections
+                yield ': keepalive\n\n'
+            after = latest
+
+    @staticmethod
+    def _by_id(members: List[Dict]) -> Dict[int, Dict]:
+        return {m['Employee_ID']: m for m in members}
+
+
+def average_billability(members: List[Dict]) -> float:
+    """Average current month billability across members"""
+    return round(
+        sum(m['current_billability'] for m in members) / len(members), 1
+    ) if members else 0
@@ -0,0 +1,153 @@
+# ============================================================================
+# FILE: models.py (NO PANDAS VERSION)
+# ============================================================================
+from types import MappingProxyType
+from typing import Dict
+
+
+class Record:
+    """Immutable row from one of the Excel sheets.
+
+    Values are exposed as attributes named after the sheet columns, and
+    ``get`` mirrors ``dict.get`` so records can be used where rows used to
+    be plain dictionaries. Date columns are formatted once, at load time,
+    into a matching ``<column>_Str`` attribute, and ``DISPLAY_FIELDS`` also
+    get a ``<column>_Display`` attribute for templates. Workbook columns
+    outside ``FIELDS`` are kept, read-only, in ``extra``.
+    """
+    __slots__ = ('extra',)
+
+    FIELDS = ()
+    DATE_FIELDS = ()
+    DISPLAY_FIELDS = ()
+
+    def __init__(self, row: Dict):
+        for field in self.FIELDS:
+            object.__setattr__(self, field, row.get(field))
+
+        for field in self.DATE_FIELDS:
+            value = row.get(field)
+            formatted = value.strftime('%Y-%m-%d') if value else None
+            object.__setattr__(self, field + '_Str', formatted)
+
+        for field in self.DISPLAY_FIELDS:
+            value = row.get(field)
+            formatted = value.strftime('%b %d, %Y') if value else None
+            object.__setattr__(self, field + '_Display', formatted)
+
+        extra = {column: value for column, value in row.items()
+                 if column is not None and column not in self.FIELDS}
+        object.__setattr__(self, 'extra', MappingProxyType(extra))
+
+    def __getattr__(self, name):
+        # Only reached for names that are not slots: look in extra columns.
+        # Guard 'extra' and dunders so a half-built instance can't recurse.
+        if name == 'extra' or name.startswith('__'):
+            raise AttributeError(name)
+        try:
+            return self.extra[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __reduce__(self):
+        # Slots are read-only, so rebuild through __init__ when unpickling
+        row = dict(self.extra)
+        row.update((field, getattr(self, field)) for field in self.FIELDS)
+        return type(self), (row,)
+
+    def __contains__(self, key):
+        return key in self.FIELDS or key in self.extra
+
+    def __repr__(self):
+        values = ', '.join(f"{f}={getattr(self, f)!r}" for f in self.FIELDS)
+        return f"{type(self).__name__}({values})"
+
+    def get(self, key, default=None):
+        """Return a column value, like dict.get"""
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict:
+        """JSON-ready dictionary using the pre-formatted dates"""
+        result = dict(self.extra)
+        result.update((field, getattr(self, field)) for field in self.FIELDS)
+        for field in self.DATE_FIELDS:
+            result[field] = getattr(self, field + '_Str')
+        return result
+
+
+class Employee(Record):
+    FIELDS = ('Employee_ID', 'Employee_Name', 'Tool', 'Role', 'Joining_Date')
+    DATE_FIELDS = ('Joining_Date',)
+    __slots__ = FIELDS + ('Joining_Date_Str',)
+
+
+class Project(Record):
+    FIELDS = ('Project_ID', 'Project_Name', 'Tool', 'Project_Status',
+              'Start_Date', 'End_Date')
+    DATE_FIELDS = ('Start_Date', 'End_Date')
+    DISPLAY_FIELDS = DATE_FIELDS
+    __slots__ = FIELDS + ('Start_Date_Str', 'End_Date_Str',
+                          'Start_Date_Display', 'End_Date_Display')
+
+
+class Assignment(Record):
+    FIELDS = ('Employee_ID', 'Project_ID', 'Billing_Start_Date',
+              'Billing_End_Date', 'Billability_Percentage')
+    DATE_FIELDS = ('Billing_Start_Date', 'Billing_End_Date')
+    __slots__ = FIELDS + ('Billing_Start_Date_Str', 'Billing_End_Date_Str')
+
+
+class BillingDay(Record):
+    FIELDS = ('Employee_ID', 'Date', 'Is_Billed')
+    __slots__ = FIELDS
+
+
+class JoinedView:
+    """Read-only join of an assignment with its employee or project.
+
+    Attribute lookups hit ``primary`` first and fall back to ``assignment``,
+    so no merged dictionary is built per row.
+    """
+    __slots__ = ('primary', 'assignment')
+
+    def __init__(self, primary: Record, assignment: Assignment):
+        object.__setattr__(self, 'primary', primary)
+        object.__setattr__(self, 'assignment', assignment)
+
+    def __getattr__(self, name):
+        # Unset slots (copy/pickle build an empty instance first) and dunders
+        # must not delegate, or self.primary would recurse back here
+        if name in JoinedView.__slots__ or name.startswith('__'):
+            raise AttributeError(name)
+        try:
+            return getattr(self.primary, name)
+        except AttributeError:
+            return getattr(self.assignment, name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __reduce__(self):
+        return JoinedView, (self.primary, self.assignment)
+
+    def get(self, key, default=None):
+        """Return a value from either side of the join, like dict.get"""
+        return getattr(self, key, default)
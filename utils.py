@@ -3,7 +3,7 @@
 # ============================================================================
 from datetime import datetime, date, timedelta
 from calendar import monthrange
-from typing import List, Dict
+from typing import Iterator, List, Dict, Tuple
 
 def calculate_working_days(year: int, month: int) -> int:
     """Calculate working days (Mon-Fri) in a month"""
@@ -108,37 +108,65 @@ def generate_yearly_grid(billing_records: List[Dict],
     
     return grid
 
-def count_billed_days(billing_records: List[Dict], 
-                     employee_id: int, 
-                     project_id: int,
-                     assignments: List[Dict]) -> int:
-    """Count billed days for an employee on a specific project"""
-    
-    # Get assignment dates
-    assignment = None
+def billed_day_shares(billing_records: List[Dict],
+                      assignments: List[Dict]) -> Iterator[Tuple[int, int, datetime, float]]:
+    """Yield (employee_id, project_id, date, share) for every billed day.
+
+    Repeated billing rows for the same employee and date count once. A day
+    inside several overlapping assignment windows is split between those
+    projects in proportion to their Billability_Percentage, so the shares
+    for one day always add up to a single billed day.
+    """
+    
+    # Group assignment windows by employee
+    windows = {}
     for a in assignments:
-        if (a.get('Employee_ID') == employee_id and 
-            a.get('Project_ID') == project_id):
-            assignment = a
-            break
-    
-    if not assignment:
-        return 0
-    
-    start_date = assignment.get('Billing_Start_Date')
-    end_date = assignment.get('Billing_End_Date')
+        start_date = a.get('Billing_Start_Date')
+        end_date = a.get('Billing_End_Date')
+        if not start_date or not end_date:
+            continue
+        
+        weight = a.get('Billability_Percentage')
+        if weight is None:
+            weight = 100
+        if weight <= 0:
+            continue
+        
+        windows.setdefault(a.get('Employee_ID'), []).append(
+            (start_date, end_date, a.get('Project_ID'), weight)
+        )
     
-    # Count billed days in this range
-    billed_count = 0
+    # Distinct billed (employee, day) pairs
+    billed = set()
     for record in billing_records:
-        if (record.get('Employee_ID') == employee_id and
-            record.get('Date') and
-            record.get('Date') >= start_date and
-            record.get('Date') <= end_date and
-            record.get('Is_Billed') == 'Yes'):
-            billed_count += 1
-    
-    return billed_count
+        if record.get('Is_Billed') == 'Yes' and record.get('Date'):
+            billed.add((record.get('Employee_ID'), record.get('Date')))
+    
+    for employee_id, day in billed:
+        # Projects whose window covers this day
+        matches = [(project_id, weight)
+                   for start_date, end_date, project_id, weight in windows.get(employee_id, ())
+                   if start_date <= day <= end_date]
+        
+        total_weight = sum(weight for _, weight in matches)
+        if total_weight <= 0:
+            continue
+        
+        for project_id, weight in matches:
+            yield employee_id, project_id, day, weight / total_weight
+
+def attribute_billed_days(billing_records: List[Dict],
+                          assignments: List[Dict]) -> Dict[Tuple[int, int], float]:
+    """Attribute every billed day to the project(s) it was billed against.
+
+    Returns {(employee_id, project_id): billed_days}.
+    """
+    billed_days = {}
+    for employee_id, project_id, _, share in billed_day_shares(billing_records, assignments):
+        key = (employee_id, project_id)
+        billed_days[key] = billed_days.get(key, 0) + share
+    
+    return billed_days
 
 def get_current_projects_count(assignments: List[Dict], 
                                projects: List[Dict],
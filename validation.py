@@ -0,0 +1,285 @@
+# ============================================================================
+# FILE: validation.py (NO PANDAS VERSION)
+# ============================================================================
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+# Column -> (type, required) for every sheet
+SCHEMAS = {
+    'employees': {
+        'Employee_ID': ('int', True),
+        'Employee_Name': ('str', True),
+        'Tool': ('str', True),
+        'Role': ('str', False),
+        'Joining_Date': ('date', False)
+    },
+    'projects': {
+        'Project_ID': ('int', True),
+        'Project_Name': ('str', True),
+        'Tool': ('str', True),
+        'Project_Status': ('str', True),
+        'Start_Date': ('date', True),
+        'End_Date': ('date', True)
+    },
+    'assignments': {
+        'Employee_ID': ('int', True),
+        'Project_ID': ('int', True),
+        'Billing_Start_Date': ('date', True),
+        'Billing_End_Date': ('date', True),
+        'Billability_Percentage': ('number', False)
+    },
+    'daily_billing': {
+        'Employee_ID': ('int', True),
+        'Date': ('date', True),
+        'Is_Billed': ('str', True)
+    }
+}
+
+# Columns restricted to a fixed set of values
+CHOICES = {
+    ('projects', 'Project_Status'): ('Ongoing', 'Upcoming', 'Completed'),
+    ('daily_billing', 'Is_Billed'): ('Yes', 'No')
+}
+
+# Columns whose combined value must be unique within a sheet
+UNIQUE = {
+    'employees': ('Employee_ID',),
+    'projects': ('Project_ID',),
+    'daily_billing': ('Employee_ID', 'Date')
+}
+
+# Sheets where a repeated unique key is a warning; the repeat is still dropped
+DUPLICATE_WARNINGS = ('daily_billing',)
+
+# (column, referenced dataset) pairs checked against the other sheets
+REFERENCES = {
+    'assignments': (('Employee_ID', 'employees'), ('Project_ID', 'projects')),
+    'daily_billing': (('Employee_ID', 'employees'),)
+}
+
+# Start/end columns that must be in order
+DATE_RANGES = {
+    'projects': ('Start_Date', 'End_Date'),
+    'assignments': ('Billing_Start_Date', 'Billing_End_Date')
+}
+
+DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S')
+
+
+class DataValidationError(Exception):
+    """Raised in strict mode when a sheet has row-level errors"""
+
+
+def parse_date(value) -> datetime:
+    """Parse a date cell, raising ValueError instead of guessing"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value.strip(), fmt)
+            except ValueError:
+                continue
+    raise ValueError(f"unparseable date {value!r}")
+
+
+def _coerce(value, kind: str):
+    """Convert a cell to the schema type, raising ValueError if impossible"""
+    if kind == 'date':
+        return parse_date(value)
+    if kind == 'str':
+        return str(value).strip()
+    if isinstance(value, bool):
+        raise ValueError(f"expected a number, got {value!r}")
+    if kind == 'int':
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+            return int(value)
+        if isinstance(value, int):
+            return value
+        raise ValueError(f"expected an integer, got {value!r}")
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"expected a number, got {value!r}")
+
+
+def issue(sheet: str, row: int, column: str, message: str,
+          severity: str = 'error') -> Dict:
+    return {
+        'sheet': sheet,
+        'row': row,
+        'column': column,
+        'message': message,
+        'severity': severity
+    }
+
+
+class SheetReport:
+    """Result of validating one sheet while it was loaded.
+
+    Besides the row-level issues it keeps the distinct foreign keys and
+    assignment windows seen, so cross-sheet checks never rescan rows.
+    """
+
+    def __init__(self, sheet: str):
+        self.sheet = sheet
+        self.issues = []
+        self.skipped_rows = 0
+        # (column, dataset) -> {value: row numbers using it}
+        self.references = {}
+        # (row, project_id, start, end) for assignment windows
+        self.windows = []
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for i in self.issues if i['severity'] == 'error')
+
+
+def normalize_sheet(key: str, sheet: str, rows: List[Dict]) -> Tuple[List[Dict], SheetReport]:
+    """Type-check and normalize rows in a single pass.
+
+    Rows with a missing or invalid required cell, and repeats of a unique
+    key, are dropped so they cannot corrupt aggregates. An invalid optional
+    cell is reported and cleared, keeping the row. Repeated Daily_Billing
+    days are only warnings: the same day may be logged once per project.
+    Row numbers match the spreadsheet (the header is row 1).
+    """
+    schema = SCHEMAS[key]
+    unique_columns = UNIQUE.get(key)
+    references = REFERENCES.get(key, ())
+    date_range = DATE_RANGES.get(key)
+    report = SheetReport(sheet)
+    seen = {}
+    valid_rows = []
+
+    for row_number, row in enumerate(rows, start=2):
+        # Trailing blank rows are common in hand-edited workbooks
+        if all(value is None or value == '' for value in row.values()):
+            continue
+
+        valid = True
+        for column, (kind, required) in schema.items():
+            value = row.get(column)
+            if value is None or value == '':
+                row[column] = None
+                if required:
+                    report.issues.append(issue(sheet, row_number, column, 'missing value'))
+                    valid = False
+                continue
+
+            try:
+                row[column] = _coerce(value, kind)
+                choices = CHOICES.get((key, column))
+                if choices and row[column] not in choices:
+                    raise ValueError(f"{row[column]!r} is not one of {', '.join(choices)}")
+            except ValueError as e:
+                report.issues.append(issue(sheet, row_number, column, str(e)))
+                # Only a bad required cell invalidates the whole row
+                row[column] = None
+                if required:
+                    valid = False
+
+        if not valid:
+            report.skipped_rows += 1
+            continue
+
+        if date_range:
+            start_column, end_column = date_range
+            if row[start_column] > row[end_column]:
+                report.issues.append(issue(
+                    sheet, row_number, end_column,
+                    f"{end_column} is before {start_column}"
+                ))
+
+        if key == 'assignments':
+            percentage = row.get('Billability_Percentage')
+            if percentage is not None and not 0 <= percentage <= 100:
+                report.issues.append(issue(
+                    sheet, row_number, 'Billability_Percentage',
+                    f"{percentage} is outside 0-100"
+                ))
+            report.windows.append((row_number, row['Project_ID'],
+                                   row['Billing_Start_Date'], row['Billing_End_Date']))
+
+        if unique_columns:
+            unique_key = tuple(row[c] for c in unique_columns)
+            if unique_key in seen:
+                report.issues.append(issue(
+                    sheet, row_number, ', '.join(unique_columns),
+                    f"duplicate of row {seen[unique_key]}",
+                    severity='warning' if key in DUPLICATE_WARNINGS else 'error'
+                ))
+                report.skipped_rows += 1
+                continue
+            seen[unique_key] = row_number
+
+        for column, dataset in references:
+            values = report.references.setdefault((column, dataset), {})
+            values.setdefault(row[column], []).append(row_number)
+
+        valid_rows.append(row)
+
+    return valid_rows, report
+
+
+def cross_check(reports: Dict[str, SheetReport], indexes: Dict[str, Dict]) -> List[Dict]:
+    """Dangling references and assignment windows outside project dates.
+
+    Works only from what ``normalize_sheet`` collected plus the ID indexes,
+    so no sheet is scanned a second time.
+    """
+    issues = []
+
+    for report in reports.values():
+        for (column, dataset), values in report.references.items():
+            known = indexes.get(dataset, {})
+            for value, row_numbers in values.items():
+                if value not in known:
+                    rows = ''
+                    if len(row_numbers) > 1:
+                        shown = ', '.join(str(n) for n in row_numbers[:5])
+                        more = len(row_numbers) - 5
+                        rows = f" (rows {shown}{f' and {more} more' if more > 0 else ''})"
+                    issues.append(issue(
+                        report.sheet, row_numbers[0], column,
+                        f"{column} {value} does not exist in {reports[dataset].sheet}{rows}"
+                    ))
+
+    assignments = reports.get('assignments')
+    projects = indexes.get('projects', {})
+    for row_number, project_id, start_date, end_date in (assignments.windows if assignments else ()):
+        project = projects.get(project_id)
+        if not project or not project.Start_Date or not project.End_Date:
+            continue
+        columns = []
+        if start_date < project.Start_Date:
+            columns.append('Billing_Start_Date')
+        if end_date > project.End_Date:
+            columns.append('Billing_End_Date')
+        if columns:
+            issues.append(issue(
+                assignments.sheet, row_number, ', '.join(columns),
+                f"assignment window {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d} is outside "
+                f"project {project_id} ({project.Start_Date_Str} to {project.End_Date_Str})"
+            ))
+
+    return issues
+
+
+def build_report(reports: Dict[str, SheetReport], indexes: Dict[str, Dict]) -> Dict:
+    """Combine per-sheet and cross-sheet issues into one JSON-ready report"""
+    issues = [i for report in reports.values() for i in report.issues]
+    issues.extend(cross_check(reports, indexes))
+
+    error_count = sum(1 for i in issues if i['severity'] == 'error')
+    return {
+        'valid': error_count == 0,
+        'error_count': error_count,
+        'warning_count': len(issues) - error_count,
+        'skipped_rows': {r.sheet: r.skipped_rows for r in reports.values()},
+        'issues': issues
+    }